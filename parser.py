@@ -1,4 +1,8 @@
 import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
 import shen
 from shen.user import User, gen_uuid
 from shen.match import Round, Match
@@ -6,82 +10,225 @@ from shen.ranker import EloRankingAlgo
 
 _i, _w, _e = shen._i, shen._w, shen._e
 
+# the key holding the name of a user in each user record format
+# (format 1, format 2)
+USER_FORMATS = ("nickname", "displayName")
 
-def parse_file(file: str):
 
-    _i(f"reading \"{file}\"...")
+def _detect_user_format(users_dct: Dict[str, dict]) -> Optional[str]:
+    """
+    Detect the user record format of a file.
 
-    shn = shen.init()
-    ranker = EloRankingAlgo()
+    Args:
+        users_dct (Dict[str, dict]): the user records of the file
+
+    Returns:
+        Optional[str]: the key holding the name of a user, or None if the
+                       format could not be detected
+    """
+    for user_dct in users_dct.values():
+        for key in USER_FORMATS:
+            if key in user_dct:
+                return key
+
+    return None
+
+
+def _discord_id(value: Any) -> Optional[str]:
+    """
+    Normalise a Discord ID from a user record.
 
+    IDs are sometimes stored in mention form, i.e. "!1234" or "<@!1234>".
+
+    Args:
+        value (Any): the ID from the record
+
+    Returns:
+        Optional[str]: the ID, or None if it is not a valid ID
+    """
+    if value is None:
+        return None
+
+    id = str(value).strip().strip("<@!>")
+    return id if id.isdigit() else None
+
+
+def _read_file(file: str) -> Dict[str, Any]:
+    """
+    Read an export file into plain records.
+
+    Args:
+        file (str): the path to the file
+
+    Returns:
+        Dict[str, Any]: the users and tournaments in the file
+    """
     with open(file, "r") as f:
         dct = json.load(f)
 
-        # for k, v in dct.items():
-        # _i(f"{k}: {v}")
+    users = []
+    key = _detect_user_format(dct["users"])
+
+    for uuid, user_dct in dct["users"].items():
+        name = user_dct.get(key)
+
+        # some files mix formats, so fall back to the other ones
+        if name is None:
+            other = _detect_user_format({uuid: user_dct})
+            if other is None:
+                _w(f"\tcannot detect the format of user \"{uuid}\" !")
+                continue
+            name = user_dct[other]
+
+        discord = _discord_id(user_dct.get("discord"))
+        if "discord" in user_dct and discord is None:
+            _w(f"\tinvalid discord ID for user \"{uuid}\" !")
+
+        users.append((uuid, name, discord))
+
+    matches = []
+    for match_id, match_dct in dct["matches"].items():
+        user_ids = match_dct["players"]
+        rounds = [(user_ids[rnd_dct["winner"]], rnd_dct.get("stage"))
+                  for rnd_dct in match_dct["games"]]
+        matches.append((match_id, user_ids, rounds))
+
+    tournaments = []
+    for tny_id in sorted(dct["players"]):
+        players = [(uuid, player_dct.get("nickname"))
+                   for uuid, player_dct in dct["players"][tny_id].items()]
+        tournaments.append((tny_id, players, matches))
+
+    return {"file": file, "users": users, "tournaments": tournaments}
+
+
+def _merge(shn: shen.Shen,
+           records: Dict[str, Any],
+           imported: Optional[Set[Tuple[str, str]]] = None):
+    """
+    Merge the records read by `_read_file()` into a Shen session.
+
+    Users are merged by UUID, tournaments by ID and matches by match ID. If
+    a user appears in more than one file, the first record read is kept; a
+    match that was already imported is skipped, so files that overlap can
+    be merged.
+
+    Args:
+        shn (Shen): the session to merge into
+        records (Dict[str, Any]): the records
+        imported (Optional[Set[Tuple[str, str]]]): the (tournament ID,
+                                                   match ID) of every match
+                                                   imported into the session
+                                                   so far. Updated in place.
+    """
+    if imported is None:
+        imported = set()
+
+    for uuid, name, discord in records["users"]:
+        if uuid not in shn.users:
+            user = shn.add_user(User(name, uuid=uuid))
+            print(f"\t{user}")
+
+            if discord is not None:
+                try:
+                    shn.connect(user, "discord", discord)
+                except ValueError as e:
+                    _w(f"\t{e}")
 
-        _i("populating users...")
+    for tny_id, players, matches in records["tournaments"]:
 
-        # read users
-        for uuid, user_dct in dct["users"].items():
+        tny = shn.tournaments.get(tny_id) or shn.create_tournament(title=tny_id)
+        joined = {player.user.uuid for player in tny.players}
 
-            user = None
+        for uuid, nickname in players:
+            if uuid not in shn.users:
+                _w(f"\tuser \"{uuid}\" does not exist, creating one...")
+                shn.add_user(User(uuid, uuid=uuid))
+            if uuid not in joined:
+                tny.add_user(shn.user(uuid), nickname=nickname)
+                joined.add(uuid)
 
-            # try parsing with format 1
-            try:
-                user = shn.add_user(User(user_dct["nickname"], uuid=uuid))
-            except Exception:
-                pass
+        for i, (match_id, user_ids, rounds) in enumerate(matches):
 
-            # try parsing with format 2
-            try:
-                user = shn.add_user(User(user_dct["displayName"], uuid=uuid))
-            except Exception:
-                pass
+            if (tny_id, match_id) in imported:
+                _i(f"match {i}: {match_id} already imported, skipping...")
+                continue
+            imported.add((tny_id, match_id))
 
-            if user:
-                print(f"\t{user}")
+            _i(f"match {i}: {' vs. '.join(user_ids)}")
 
-        _i("populating tournaments...")
-        for tny_id, players_dct in dct["players"].items():
+            for user_id in user_ids:
+                if user_id not in shn.users:
+                    _w(f"\tcannot find user {user_id} !")
 
-            tny = shn.create_tournament(title=tny_id)
+            users = [shn.user(uuid) for uuid in user_ids]
+            match = tny.start_match(users=users)
 
-            for uuid, player_dct in players_dct.items():
-                nickname = player_dct.get("nickname")
-                try:
-                    tny.add_user(shn.user(uuid), nickname=nickname)
-                except Exception:
-                    _w(f"\tuser \"{uuid}\" does not exist, creating one...")
-                    user = shn.add_user(User(uuid, uuid=uuid))
-                    tny.add_user(shn.user(uuid), nickname=nickname)
+            for winner_id, stage in rounds:
+                rnd = match.record_win(shn.user(winner_id))
+                rnd.meta["stage"] = stage
+
+
+def parse_files(files: List[str],
+                processes: Optional[int] = None) -> shen.Shen:
+    """
+    Read many export files in parallel into one Shen session.
+
+    Parallelism is per file: each file is parsed into plain records in a
+    worker process. Users, players and matches are then created in this
+    process, one file at a time, in the order the files were given, so the
+    session created is the same regardless of which worker finishes first.
+
+    Only parsing runs in parallel, so this is only faster than reading the
+    files one by one when the files are large. With a single file, or with
+    `processes=1`, no worker processes are started.
+
+    Args:
+        files (List[str]): the paths to the files
+        processes (Optional[int]): the number of worker processes.
+                                   Defaults to the number of CPUs.
+
+    Returns:
+        Shen: the session containing every user and tournament read
+    """
+    _i(f"reading {len(files)} file(s)...")
+
+    if len(files) == 1 or processes == 1:
+        results = [_read_file(file) for file in files]
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            results = list(pool.map(_read_file, files))
 
-            i = 0
-            for match_id, match_dct in dct["matches"].items():
+    shn = shen.init()
+    imported = set()
+    for records in results:
+        _merge(shn, records, imported)
+
+    _i("finished reading.")
+    _i(f"{len(shn.users)} user(s) found.")
 
-                user_ids = match_dct["players"]
+    return shn
 
-                _i(f"match {i}: {' vs. '.join(user_ids)}")
 
-                for user_id in user_ids:
-                    if user_id not in shn.users:
-                        _w(f"\tcannot find user {user_id} !")
+def parse_file(file: str):
 
-                users = [shn.user(uuid) for uuid in user_ids]
-                match = tny.start_match(users=users)
+    _i(f"reading \"{file}\"...")
 
-                for rnd_dct in match_dct["games"]:
-                    winner = shn.user(user_ids[rnd_dct["winner"]])
-                    rnd = match.record_win(winner)
-                    rnd.meta["stage"] = rnd_dct.get("stage")
+    shn = shen.init()
+    ranker = EloRankingAlgo()
 
-                i += 1
+    _merge(shn, _read_file(file))
 
     _i("finished reading.")
     _i(f"{len(shn.users)} user(s) found.")
 
-    ranker.start(tny)
+    for tny in shn.tournaments.values():
+        ranker.start(tny)
 
 
 if __name__ == "__main__":
-    parse_file("club-shen-export.json")
+    if len(sys.argv) > 2:
+        parse_files(sys.argv[1:])
+    else:
+        parse_file(sys.argv[1] if len(sys.argv) > 1 else
+                   "club-shen-export.json")
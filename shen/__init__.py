@@ -1,8 +1,8 @@
 #!/usr/bin/python3
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
-from shen.user import User
+from shen.user import User, DiscriminatorPool
 from shen.tournament import Tournament
 from shen.match import Match
 
@@ -25,6 +25,18 @@ class Shen:
         # the users in this session
         self.users: Dict[Any, User] = {}
 
+        # the tournaments in this session
+        self.tournaments: Dict[str, Tournament] = {}
+
+        # the users by their case-folded tag
+        self._tags: Dict[str, User] = {}
+
+        # the users by their (service, ID) connections
+        self._connections: Dict[Tuple[str, Any], User] = {}
+
+        # the unused discriminators by case-folded username
+        self._discriminators: Dict[str, DiscriminatorPool] = {}
+
     def create_user(self, name: str) -> User:
         """
         Create a new user.
@@ -35,14 +47,111 @@ class Shen:
         Returns:
             User: the user created
         """
-        user = User(name)
-        self.users[user.uuid] = user
-        return user
+        user = User(name, self._pool(name).take())
+        return self.add_user(user)
 
     def add_user(self, user: User):
+        """
+        Add an existing user.
+
+        If the tag of the user is already taken by another user, the user is
+        given a new discriminator and a warning with the new tag is logged.
+
+        Args:
+            user (User): the user
+
+        Returns:
+            User: the user
+        """
+        old = self.users.get(user.uuid)
+        if old is not None:
+            self._remove_indexes(old)
+
+        pool = self._pool(user.username)
+        if user.get_tag().casefold() in self._tags:
+            old_tag = user.get_tag()
+            user.discriminator = pool.take()
+            _w(f"the tag {old_tag} is taken, "
+               f"{user.uuid} was given the tag {user.get_tag()}")
+        elif pool.is_free(user.discriminator):
+            pool.reserve(user.discriminator)
+
         self.users[user.uuid] = user
+        self._tags[user.get_tag().casefold()] = user
+        for service, id in user.connections.items():
+            self._connections[(service, id)] = user
+
         return user
 
+    def _pool(self, username: str) -> DiscriminatorPool:
+        key = username.casefold()
+        pool = self._discriminators.get(key)
+        if pool is None:
+            pool = self._discriminators[key] = DiscriminatorPool()
+        return pool
+
+    def _remove_indexes(self, user: User):
+        del self._tags[user.get_tag().casefold()]
+        for service, id in user.connections.items():
+            del self._connections[(service, id)]
+
+        # the discriminator is not returned to the pool, so it is never
+        # reused by someone else
+
+    def connect(self, user: User, service: str, id: Any):
+        """
+        Connect a user to their ID on another service, i.e. Discord.
+
+        Args:
+            user (User): the user
+            service (str): the name of the service, i.e. "discord"
+            id (Any): the ID of the user on the service
+
+        Raises:
+            ValueError: if the ID is connected to another user
+        """
+        other = self._connections.get((service, id))
+        if other is not None and other != user:
+            raise ValueError(f"the {service} ID {id} is connected to {other}")
+
+        old_id = user.connections.get(service)
+        if old_id is not None:
+            del self._connections[(service, old_id)]
+
+        user.connections[service] = id
+        self._connections[(service, id)] = user
+
+    def user_by_tag(self, tag: str) -> User:
+        """
+        Get a user by their tag ("<username>#<discriminator>"), ignoring case.
+
+        Args:
+            tag (str): the tag of the user
+
+        Raises:
+            KeyError: if no user has the tag
+
+        Returns:
+            User: the user
+        """
+        return self._tags[tag.casefold()]
+
+    def user_by_connection(self, service: str, id: Any) -> User:
+        """
+        Get a user by their ID on another service.
+
+        Args:
+            service (str): the name of the service, i.e. "discord"
+            id (Any): the ID of the user on the service
+
+        Raises:
+            KeyError: if no user is connected with the ID
+
+        Returns:
+            User: the user
+        """
+        return self._connections[(service, id)]
+
     def user(self, uuid_or_user) -> User:
         """
         Get a user by their UUID.
@@ -71,7 +180,9 @@ class Shen:
         Returns:
             Tournament: the tournament created
         """
-        return Tournament(self, title, users)
+        tny = Tournament(self, title, users)
+        self.tournaments[title] = tny
+        return tny
 
 
 def init() -> "Shen":
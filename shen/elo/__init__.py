@@ -1,19 +1,79 @@
 import math
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+
+def _expected_score(diff: float) -> float:
+    return 1 / (1 + math.pow(10, diff / 400))
+
+
+@lru_cache(maxsize=None)
+def _kernel_tables(k: float,
+                   span: int) -> Tuple[List[float], Dict[int, List[int]]]:
+    """Builds the tables of kernel mode. The tables only depend on `k` and
+    `span`, so they are shared by every `Elo` using the same values."""
+    expected = [_expected_score(diff) for diff in range(-span, span + 1)]
+
+    # the adjustments for a win (1) and a loss (0)
+    adjustments = {
+        score: [round(k * (score - e)) for e in expected]
+        for score in (1, 0)
+    }
+
+    return expected, adjustments
 
 
 class Elo:
-    def __init__(self, floor: float = 0, k: float = 40):
+    def __init__(self,
+                 floor: float = 0,
+                 k: float = 40,
+                 kernel: bool = False,
+                 span: int = 4000):
         """In the Elo rating system, the k-factor `k` determines how much a
         player's skill rating can change with each win or loss.
 
+        In kernel mode, the expected scores and the adjustments for a win or
+        a loss are computed ahead of time for every integer rating difference
+        between `-span` and `span` for the k-factor given. Ratings are
+        usually integers, so most calls become table lookups. The results are
+        identical to the ones computed without kernel mode; other differences
+        and scores are computed as usual.
+
         Args:
             floor (float, optional): the lowest skill rating a player can have.
                                      Defaults to 0.
             k (float, optional): the k-factor to use.
                                  Defaults to 40.
+            kernel (bool, optional): whether to use kernel mode.
+                                     Defaults to False.
+            span (int, optional): the largest rating difference to compute
+                                  ahead of time in kernel mode.
+                                  Defaults to 4000.
         """
         self.floor = floor
         self.k = k
+        self.span = span
+
+        # the tables of kernel mode, indexed by rating difference + span
+        self._expected = None
+        self._adjustments = None
+
+        if kernel:
+            self._expected, self._adjustments = _kernel_tables(k, span)
+
+    def _index(self, diff: float):
+        # gets the index of a rating difference in the tables, if any
+        if diff.__class__ is float:
+            if not diff.is_integer():
+                return None
+            diff = int(diff)
+        elif diff.__class__ is not int:
+            return None
+
+        i = diff + self.span
+        if 0 <= i <= 2 * self.span:
+            return i
+        return None
 
     def get_expected_score(self, a_or_diff: float, b: float = None):
         """Calculates the expected score of a player with rating `a` based on
@@ -33,7 +93,12 @@ class Elo:
         else:
             diff = b - a_or_diff
 
-        return 1 / (1 + math.pow(10, diff / 400))
+        if self._expected is not None:
+            i = self._index(diff)
+            if i is not None:
+                return self._expected[i]
+
+        return _expected_score(diff)
 
     def get_adjustment(self, a: float, b: float, score: float):
         """Calculates the rating adjustment using a player's rating `a`,
@@ -48,5 +113,12 @@ class Elo:
             b (float): [description]
             score (float): [description]
         """
+        if self._adjustments is not None:
+            table = self._adjustments.get(score)
+            if table is not None:
+                i = self._index(b - a)
+                if i is not None:
+                    return table[i]
+
         expected_score = self.get_expected_score(a, b)
         return round(self.k * (score - expected_score))
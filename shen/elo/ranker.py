@@ -1,11 +1,11 @@
 from __future__ import annotations
 import copy as _copy
 import math
-from typing import Dict, List
+from typing import Dict, List, Optional
 from operator import attrgetter
 
 from shen.elo import Elo
-from shen.match import Match
+from shen.match import Match, MatchFacts
 from shen.leaderboard import Leaderboard
 from shen.tournament import Tournament
 from shen.user import User
@@ -26,13 +26,19 @@ class Stats:
         self.meta: dict = meta
 
     def copy(self) -> Stats:
-        return _copy.copy(self)
+        stats = _copy.copy(self)
+        stats.meta = dict(self.meta)
+        return stats
 
 
 class RankingMethod:
-    def __init__(self):
-
-        self.elo: Elo = Elo()
+    def __init__(self, k: float = 40):
+        """
+        Args:
+            k (float, optional): the k-factor of the Elo rating system.
+                                 Defaults to 40.
+        """
+        self.elo: Elo = Elo(k=k, kernel=True)
 
     def generate_leaderboards(self, tournament: Tournament) -> Leaderboard:
         """
@@ -42,26 +48,59 @@ class RankingMethod:
             tournament (Tournament): the tournament to generate a
                                      leaderboard for
         """
-        stats_dict: Dict[User, Stats] = {}
-
         print('starting leaderboard generation...')
         print(f'(using ${ len(tournament.matches) } matches)')
 
+        self.on_start(tournament)
+
         for match in tournament.matches:
+            self.on_match(match)
+
+        return self.on_finish(tournament)
+
+    def on_start(self, tournament: Tournament):
+        """
+        Called before the first match is read.
+
+        Args:
+            tournament (Tournament): the tournament
+        """
+        self.stats_dict: Dict[User, Stats] = {}
+
+    def on_match(self, match: Match, facts: Optional[MatchFacts] = None):
+        """
+        Called for every match, in order.
+
+        Args:
+            match (Match): the match
+            facts (Optional[MatchFacts]): the facts about the match, if they
+                                          were already computed
+        """
+        facts = facts or match.get_facts()
 
-            for user in match.users:
-                stats = stats_dict.get(user, self.on_init_stats(user))
+        new_stats_dict = {}
+        for player in match.players:
 
-            new_stats_dict = {}
-            for user in match.users:
+            stats = self.stats_dict.get(player.user) or self.on_init_stats(
+                player.user)
 
-                new_stats_dict[user] = self.on_process_stats(
-                    stats_dict, stats, match)
+            new_stats_dict[player.user] = self.on_process_stats(
+                self.stats_dict, stats, match, facts)
 
-            # merge the modified stats with the originals
-            stats_dict = {**stats_dict, **new_stats_dict}
+        # merge the modified stats with the originals
+        self.stats_dict = {**self.stats_dict, **new_stats_dict}
 
-        stats_list = self.on_sort_stats(list(stats_dict.values()))
+    def on_finish(self, tournament: Tournament) -> Leaderboard:
+        """
+        Called after the last match is read.
+
+        Args:
+            tournament (Tournament): the tournament
+
+        Returns:
+            Leaderboard: the leaderboard generated
+        """
+        stats_list = self.on_sort_stats(list(self.stats_dict.values()))
         return Leaderboard(tournament, stats_list)
 
     def on_init_stats(self, user: User) -> Stats:
@@ -77,7 +116,7 @@ class RankingMethod:
         return Stats(user, rating=1000)
 
     def on_process_stats(self, stats_dict: Dict[User, Stats], stats: Stats,
-                         match: Match) -> Stats:
+                         match: Match, facts: MatchFacts) -> Stats:
         """
         Process a user's statistics based on a match they played.
         This method should return an updated version of the stats given.
@@ -85,22 +124,25 @@ class RankingMethod:
         Args:
             stats (Stats): the statistics of a user in the match
             match (Match): the match that was played
+            facts (MatchFacts): the facts about the match
 
         Returns:
             Stats: an updated version of the statistics given
         """
         user: User = stats.user
+        player = match.tny._player(user)
         stats = stats.copy()
 
         stats.match_count += 1
-        if match.winner == user:
+        if facts.winner == player:
             stats.win_count += 1
             score = 1
         else:
             score = 0
 
-        for opponent in match.opponents_of(stats.user):
-            o_stats = stats_dict.get(opponent, self.on_init_stats(user))
+        for opponent in facts.opponents[player]:
+            o_stats = stats_dict.get(opponent.user) or self.on_init_stats(
+                opponent.user)
 
         adjustment = math.ceil(
             self.elo.get_adjustment(stats.meta['rating'],
@@ -0,0 +1,173 @@
+"""
+History
+=======
+
+A rating history records how a player's rating evolved over the course of a
+tournament.
+
+Every time a match is processed by a ranker, an entry of
+(match index, time, rating) is appended to the history of each player in
+the match. Entries are kept in compact typed arrays rather than lists of
+objects so that the histories of hundreds of players stay small.
+
+### Range Queries
+
+Entries are appended in match order, so both the match indices and the
+times are sorted. This allows queries such as "ratings between two dates"
+to be answered with a binary search instead of a scan.
+
+### Storage
+
+For storage, a history is delta encoded: each value is stored as the
+difference from the previous value. Ratings and match indices change by
+small amounts between entries, so the encoded form is mostly small numbers.
+Times are stored with millisecond precision.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class RatingHistory:
+    """
+    An append-only time series of a player's rating.
+    """
+
+    def __init__(self):
+
+        # the index of the match (within the tournament) of each entry
+        self.indices: array = array("l")
+
+        # the time of the match of each entry
+        self.times: array = array("d")
+
+        # the rating of the player after the match of each entry
+        self.ratings: array = array("l")
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator[Tuple[int, float, int]]:
+        return zip(self.indices, self.times, self.ratings)
+
+    def append(self, index: int, time: float, rating: int):
+        """
+        Append an entry to this history.
+
+        Args:
+            index (int): the index of the match
+            time (float): the time of the match
+            rating (int): the rating of the player after the match
+
+        Raises:
+            ValueError: if the entry is older than the last entry
+        """
+        if self.indices and index < self.indices[-1]:
+            raise ValueError(f"match {index} is older than the last entry "
+                             f"({self.indices[-1]})")
+
+        self.indices.append(index)
+        self.times.append(time)
+        self.ratings.append(rating)
+
+    def truncate(self, index: int):
+        """
+        Remove every entry from the match `index` onwards.
+
+        Args:
+            index (int): the index of the first match to remove
+        """
+        n = bisect_left(self.indices, index)
+        del self.indices[n:]
+        del self.times[n:]
+        del self.ratings[n:]
+
+    def latest(self) -> Optional[int]:
+        """
+        Get the most recent rating in this history.
+
+        Returns:
+            Optional[int]: the rating, or None if the history is empty
+        """
+        return self.ratings[-1] if self.ratings else None
+
+    def rating_at(self, time: float) -> Optional[int]:
+        """
+        Get the rating of the player at a given time.
+
+        Args:
+            time (float): the time
+
+        Returns:
+            Optional[int]: the rating, or None if the player had not played
+                           any matches by then
+        """
+        n = bisect_right(self.times, time)
+        return self.ratings[n - 1] if n else None
+
+    def between(self, start: float,
+                end: float) -> List[Tuple[int, float, int]]:
+        """
+        Get the entries with a time between `start` and `end` inclusive.
+
+        Args:
+            start (float): the earliest time
+            end (float): the latest time
+
+        Returns:
+            List[Tuple[int, float, int]]: (match index, time, rating) entries
+        """
+        lo = bisect_left(self.times, start)
+        hi = bisect_right(self.times, end)
+        return list(
+            zip(self.indices[lo:hi], self.times[lo:hi], self.ratings[lo:hi]))
+
+    def encode(self) -> Dict[str, List[int]]:
+        """
+        Delta encode this history for storage.
+
+        Returns:
+            Dict[str, List[int]]: the encoded history
+        """
+        return {
+            "indices": _delta_encode(self.indices),
+            "times": _delta_encode(round(t * 1000) for t in self.times),
+            "ratings": _delta_encode(self.ratings),
+        }
+
+    @classmethod
+    def decode(cls, dct: Dict[str, List[int]]) -> "RatingHistory":
+        """
+        Decode a history created by `encode()`.
+
+        Args:
+            dct (Dict[str, List[int]]): the encoded history
+
+        Returns:
+            RatingHistory: the decoded history
+        """
+        history = cls()
+        history.indices = array("l", _delta_decode(dct["indices"]))
+        history.times = array("d",
+                              (t / 1000 for t in _delta_decode(dct["times"])))
+        history.ratings = array("l", _delta_decode(dct["ratings"]))
+        return history
+
+
+def _delta_encode(values) -> list:
+    prev = 0
+    deltas = []
+    for value in values:
+        deltas.append(value - prev)
+        prev = value
+    return deltas
+
+
+def _delta_decode(deltas) -> list:
+    total = 0
+    values = []
+    for delta in deltas:
+        total += delta
+        values.append(total)
+    return values
@@ -1,6 +1,9 @@
 
 from __future__ import annotations
-from typing import List, Type, Dict, TYPE_CHECKING
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import (Any, Callable, Hashable, Iterable, List, Optional, Tuple,
+                    Type, Dict, TYPE_CHECKING)
 from operator import attrgetter
 
 if TYPE_CHECKING:
@@ -14,12 +17,267 @@ class Leaderboard:
     Represents the leaderboard of a tournament at a given moment in time.
     """
 
-    def __init__(self, tournament: Tournament, stat_list: List[Stats]):
+    def __init__(self,
+                 tournament: Tournament,
+                 stat_list: List[Stats],
+                 no_matches: Optional[List[User]] = None):
 
         # the tournament that this leaderboard is of
         self._tournament: Tournament = tournament
 
         self._stat_list: List[Stats] = stat_list
 
+        # the users in the tournament that have not played any matches
+        self.no_matches: List[User] = no_matches or []
+
+        # the version of the tournament this leaderboard was generated from
+        self.version: int = getattr(tournament, "version", 0)
+
+        # the place of each user by UUID
+        self._places: Dict[Any, int] = {
+            stats.user.uuid: place
+            for place, stats in enumerate(stat_list)
+        }
+
+    def __len__(self) -> int:
+        return len(self._stat_list)
+
     def get_by_place(self, n) -> Stats:
         return self._stat_list[n]
+
+    def get_place(self, user: User) -> Optional[int]:
+        """
+        Get the place of a user on this leaderboard (starting from 0).
+
+        Args:
+            user (User): the user
+
+        Returns:
+            Optional[int]: the place, or None if the user is not on this
+                           leaderboard
+        """
+        return self._places.get(user.uuid)
+
+    def diff(self,
+             old: Leaderboard,
+             changed: Optional[Iterable[Any]] = None) -> LeaderboardDelta:
+        """
+        Compute the changes from an older leaderboard to this one.
+
+        If the UUIDs of the players whose stats changed are given (i.e. from
+        `RankingAlgo.update`), only the places between the highest and lowest
+        of those players are compared. Otherwise, every place is compared.
+
+        Args:
+            old (Leaderboard): the older leaderboard
+            changed (Optional[Iterable[Any]]): the UUIDs of the players whose
+                                               stats changed
+
+        Returns:
+            LeaderboardDelta: the changes
+        """
+        delta = LeaderboardDelta(old.version, self.version)
+
+        if changed is None:
+            lo, hi = 0, max(len(old), len(self))
+        else:
+            places = []
+            shifted = False
+            for uuid in changed:
+                found = [board._places.get(uuid) for board in (old, self)]
+                places.extend(place for place in found if place is not None)
+
+                # a player entering or leaving shifts everyone below them
+                if found.count(None) == 1:
+                    shifted = True
+
+            if not places:
+                return delta
+
+            # only the players between the changed ones can have moved
+            lo, hi = min(places), max(places) + 1
+            if shifted:
+                hi = max(len(old), len(self))
+
+        # the users to compare, in the order they appear
+        uuids: Dict[Any, User] = {}
+        for board in (old, self):
+            for stats in board._stat_list[lo:hi]:
+                uuids.setdefault(stats.user.uuid, stats.user)
+
+        no_matches = {user.uuid for user in old.no_matches}
+
+        for uuid, user in uuids.items():
+            old_place = old._places.get(uuid)
+            new_place = self._places.get(uuid)
+
+            if old_place is None:
+                delta.entered.append(user)
+                if uuid in no_matches:
+                    delta.left_no_matches.append(user)
+                continue
+
+            if new_place is None:
+                delta.left.append(user)
+                continue
+
+            if old_place != new_place:
+                delta.moved.append((user, old_place, new_place))
+
+            old_rating = old._stat_list[old_place].meta.get("rating")
+            new_rating = self._stat_list[new_place].meta.get("rating")
+            if old_rating != new_rating:
+                delta.rated.append((user, old_rating, new_rating))
+
+        return delta
+
+
+@dataclass
+class LeaderboardDelta:
+    """
+    The changes between two leaderboards of a tournament.
+    """
+
+    # the versions of the tournament the leaderboards were generated from
+    from_version: int
+    to_version: int
+
+    # the users that changed places as (user, old place, new place)
+    moved: List[Tuple[User, int, int]] = field(default_factory=lambda: [])
+
+    # the users whose ratings changed as (user, old rating, new rating)
+    rated: List[Tuple[User, Any, Any]] = field(default_factory=lambda: [])
+
+    # the users that are new to the leaderboard
+    entered: List[User] = field(default_factory=lambda: [])
+
+    # the users that are new to the leaderboard and had no matches before
+    left_no_matches: List[User] = field(default_factory=lambda: [])
+
+    # the users that are no longer on the leaderboard
+    left: List[User] = field(default_factory=lambda: [])
+
+    def __bool__(self) -> bool:
+        return bool(self.moved or self.rated or self.entered or self.left)
+
+
+class LeaderboardPublisher:
+    """
+    Publishes only the changes to a leaderboard to its subscribers.
+    """
+
+    def __init__(self, leaderboard: Optional[Leaderboard] = None):
+
+        # the last leaderboard published
+        self.leaderboard: Optional[Leaderboard] = leaderboard
+
+        self._subscribers: List[Callable[[LeaderboardDelta], Any]] = []
+
+    def subscribe(self, callback: Callable[[LeaderboardDelta], Any]):
+        """
+        Call `callback` with every delta published.
+
+        Args:
+            callback (Callable[[LeaderboardDelta], Any]): the callback
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[LeaderboardDelta], Any]):
+        self._subscribers.remove(callback)
+
+    def publish(self,
+                leaderboard: Leaderboard,
+                changed: Optional[Iterable[Any]] = None) -> LeaderboardDelta:
+        """
+        Publish a new leaderboard. Subscribers are only called if it differs
+        from the last leaderboard published. The first leaderboard published
+        is compared to an empty leaderboard of version 0.
+
+        Args:
+            leaderboard (Leaderboard): the new leaderboard
+            changed (Optional[Iterable[Any]]): the UUIDs of the players whose
+                                               stats changed, if known
+
+        Returns:
+            LeaderboardDelta: the changes published
+        """
+        old = self.leaderboard
+        if old is None:
+            # nothing was published yet, so the first delta is from version 0
+            old = Leaderboard(leaderboard._tournament, [])
+            old.version = 0
+
+        delta = leaderboard.diff(old, changed)
+        self.leaderboard = leaderboard
+
+        if delta:
+            for callback in self._subscribers:
+                callback(delta)
+
+        return delta
+
+
+class LeaderboardCache:
+    """
+    A least-recently-used cache of leaderboards.
+
+    Leaderboards are keyed by the version of the tournament they were
+    generated from, so a leaderboard is never served after a tournament
+    changes. Leaderboards of older versions are never read again, so they
+    are dropped as soon as a leaderboard of a newer version is cached.
+    """
+
+    def __init__(self, maxsize: int = 32):
+
+        # the maximum number of leaderboards to keep
+        self.maxsize: int = maxsize
+
+        # the version of the tournament the cached leaderboards are of
+        self.version: int = 0
+
+        self._entries: OrderedDict[Hashable, Leaderboard] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Leaderboard]:
+        """
+        Get a cached leaderboard.
+
+        Args:
+            key (Hashable): the key of the leaderboard
+
+        Returns:
+            Optional[Leaderboard]: the leaderboard, or None if not cached
+        """
+        leaderboard = self._entries.get(key)
+        if leaderboard is not None:
+            self._entries.move_to_end(key)
+        return leaderboard
+
+    def put(self, key: Hashable, leaderboard: Leaderboard):
+        """
+        Cache a leaderboard, evicting the least recently used one if the
+        cache is full.
+
+        Every leaderboard of an older version is dropped, and a leaderboard
+        older than the ones cached is not cached at all.
+
+        Args:
+            key (Hashable): the key of the leaderboard
+            leaderboard (Leaderboard): the leaderboard
+        """
+        if leaderboard.version < self.version:
+            return
+
+        if leaderboard.version > self.version:
+            self._entries.clear()
+            self.version = leaderboard.version
+
+        self._entries[key] = leaderboard
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
@@ -27,6 +27,22 @@ class Round:
     player_meta: dict = field(default_factory=lambda: {})
 
 
+@dataclass
+class MatchFacts:
+    """Facts about a finished match, computed once and shared by everything
+    that reads the match (i.e. rankers).
+    """
+
+    # the winner of the match, or the first winner if there are multiple
+    winner: Optional[Player]
+
+    # the score of each player
+    scores: Dict[Player, int]
+
+    # the opponents of each player
+    opponents: Dict[Player, List[Player]]
+
+
 @dataclass
 class Match:
     """Represents a tournament match.
@@ -44,7 +60,7 @@ class Match:
     best_of: int = 3
 
     # the time this match took place
-    time: float = _time.time()
+    time: float = field(default_factory=_time.time)
 
     # a list of rounds in this match
     rounds: List[Round] = field(default_factory=lambda: [])
@@ -61,6 +77,7 @@ class Match:
 
         rnd = Round(players, player_meta=player_meta)
         self.rounds.append(rnd)
+        self.tny._match_changed(self)
         return rnd
 
     def get_score(self, player: Player) -> int:
@@ -142,3 +159,31 @@ class Match:
 
     def is_finished(self) -> bool:
         return self.get_winner() is not None
+
+    def get_facts(self) -> MatchFacts:
+        """Gets the winner, scores and opponents of every player at once.
+
+        Returns:
+            MatchFacts: the facts about this match
+        """
+        scores: Dict[Player, int] = {player: 0 for player in self.players}
+
+        for rnd in self.rounds:
+            for player in rnd.winners:
+                if player in scores:
+                    scores[player] += 1
+
+        # the same winner as get_winner()
+        high_score = 0
+        winner = None
+        for player, score in scores.items():
+            if score > high_score:
+                high_score = score
+                winner = player
+
+        opponents = {
+            player: [opp for opp in self.players if opp != player]
+            for player in self.players
+        }
+
+        return MatchFacts(winner, scores, opponents)
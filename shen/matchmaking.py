@@ -0,0 +1,202 @@
+"""
+Matchmaking
+===========
+
+The matchmaking queue pairs waiting players of a ladder with opponents of
+a similar rating.
+
+Waiting players are kept ordered by rating. When pairings are made, the
+pairs of players with the smallest rating difference are paired first, as
+long as the difference is within the _window_ of one of the players. Only
+the `lookahead` nearest players above each player are considered.
+
+### Windows
+
+Every time a player is left unpaired, their window widens by `widen`
+(up to `max_window`), so players with unusual ratings are eventually
+paired as well.
+
+### Rematches
+
+The last `memory` opponents of every player are remembered, and players
+are not paired with a recent opponent, unless one of them has waited long
+enough for their window to reach `max_window`.
+"""
+
+from bisect import insort
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from shen.user import User
+    from shen.match import Match
+    from shen.tournament import Tournament
+
+
+class MatchmakingQueue:
+    """
+    A queue of players waiting for a match in a tournament.
+    """
+
+    def __init__(self,
+                 tny: "Tournament",
+                 window: int = 50,
+                 widen: int = 25,
+                 max_window: int = 400,
+                 memory: int = 3,
+                 lookahead: int = 8):
+        """
+        Create a matchmaking queue.
+
+        Args:
+            tny (Tournament): the tournament to create matches in
+            window (int): the largest rating difference allowed at first
+            widen (int): how much the window widens each time a player is
+                         left unpaired
+            max_window (int): the largest rating difference ever allowed
+            memory (int): the number of recent opponents to avoid
+            lookahead (int): the number of candidates to consider for each
+                             player
+        """
+        self.tny: Tournament = tny
+
+        self.window: int = window
+        self.widen: int = widen
+        self.max_window: int = max_window
+        self.memory: int = memory
+        self.lookahead: int = lookahead
+
+        # the waiting players as (rating, ticket, user), ordered by rating
+        self._queue: List[Tuple[int, int, User]] = []
+
+        # the number of times each waiting player was left unpaired
+        self._waits: Dict[Any, int] = {}
+
+        # the recent opponents of every player
+        self._recent: Dict[Any, Deque[Any]] = {}
+
+        # incremented for every player queued, to break ties in rating
+        self._ticket: int = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def __contains__(self, user: "User") -> bool:
+        return user.uuid in self._waits
+
+    def enqueue(self, user: "User", rating: int = 1500):
+        """
+        Add a player to the queue.
+
+        Args:
+            user (User): the user
+            rating (int): the rating of the user
+
+        Raises:
+            ValueError: if the user is already queued
+        """
+        if user.uuid in self._waits:
+            raise ValueError(f"the user {user} is already queued")
+
+        insort(self._queue, (rating, self._ticket, user))
+        self._waits[user.uuid] = 0
+        self._ticket += 1
+
+    def remove(self, user: "User"):
+        """
+        Remove a player from the queue.
+
+        Args:
+            user (User): the user
+
+        Raises:
+            ValueError: if the user is not queued
+        """
+        if self._waits.pop(user.uuid, None) is None:
+            raise ValueError(f"the user {user} is not queued")
+
+        self._queue = [entry for entry in self._queue if entry[2] != user]
+
+    def is_recent(self, a: "User", b: "User") -> bool:
+        """
+        Check if two players have played each other recently.
+        """
+        recent = self._recent.get(a.uuid)
+        return recent is not None and b.uuid in recent
+
+    def _remember(self, a: "User", b: "User"):
+        for user, opponent in ((a, b), (b, a)):
+            recent = self._recent.get(user.uuid)
+            if recent is None:
+                recent = self._recent[user.uuid] = deque(maxlen=self.memory)
+            recent.append(opponent.uuid)
+
+    def _window(self, user: "User") -> int:
+        return min(self.window + self._waits[user.uuid] * self.widen,
+                   self.max_window)
+
+    def pair(self) -> List[Tuple["User", "User"]]:
+        """
+        Pair the waiting players.
+
+        Paired players are removed from the queue; the windows of the players
+        left unpaired widen.
+
+        Returns:
+            List[Tuple[User, User]]: the pairings made
+        """
+        queue = self._queue
+        windows = [self._window(user) for _, _, user in queue]
+        paired = [False] * len(queue)
+        pairings = []
+
+        # collect the possible pairs as (difference, i, j); the queue is
+        # ordered, so the nearest candidates of a player come right after it
+        edges = []
+        for i, (rating, _, user) in enumerate(queue):
+            for j in range(i + 1, min(i + 1 + self.lookahead, len(queue))):
+                opp_rating, _, opponent = queue[j]
+                diff = opp_rating - rating
+                window = max(windows[i], windows[j])
+                if diff > window:
+                    continue
+
+                # rematches are allowed once a player has waited long enough
+                if (window < self.max_window
+                        and self.is_recent(user, opponent)):
+                    continue
+
+                edges.append((diff, i, j))
+
+        # pair the nearest players first
+        edges.sort()
+        for _, i, j in edges:
+            if paired[i] or paired[j]:
+                continue
+
+            user, opponent = queue[i][2], queue[j][2]
+            paired[i] = paired[j] = True
+            pairings.append((user, opponent))
+            self._remember(user, opponent)
+
+        self._queue = []
+        for i, entry in enumerate(queue):
+            if paired[i]:
+                del self._waits[entry[2].uuid]
+            else:
+                self._waits[entry[2].uuid] += 1
+                self._queue.append(entry)
+
+        return pairings
+
+    def start_matches(self, best_of=3) -> List["Match"]:
+        """
+        Pair the waiting players and start a match for each pairing.
+
+        Args:
+            best_of (int): the max number of rounds in each match
+
+        Returns:
+            List[Match]: the matches started
+        """
+        return self.tny.start_matches(self.pair(), best_of=best_of)
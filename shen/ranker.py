@@ -36,27 +36,68 @@ the winner will switch ranks with the loser.
 
 If a player is inactive for too long, their rank will "decay" and they will
 switch ranks with the player below them.
+
+Rating History
+--------------
+
+The Elo ranker keeps a `RatingHistory` for every player (see `shen.history`),
+so the rating of a player at any point of the tournament can be looked up
+without replaying the matches.
+
+Corrections
+-----------
+
+While reading matches, the ranker saves its state every few matches. When a
+match is inserted, amended or deleted (see `Tournament.insert_match`,
+`Tournament.amend_match` and `Tournament.delete_match`), `RankingAlgo.update`
+restores the nearest saved state before the edit and only replays the
+matches after it.
+
+Running Many Rankers
+--------------------
+
+`CompositeRanker` runs any number of rankers (`RankingAlgo` or
+`shen.elo.ranker.RankingMethod`) in a single pass over the matches. The
+winner, scores and opponents of each match are computed once (see
+`Match.get_facts`) and shared by every ranker.
 """
 
 import math
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List
+from typing import Any, Dict, List, Optional, Set
 from shen import Shen, _i, _w, _e
 from shen.user import User
 from shen.player import Player
-from shen.match import Match
+from shen.match import Match, MatchFacts
 from shen.elo import Elo
+from shen.elo.ranker import Stats
+from shen.leaderboard import Leaderboard
 from shen.tournament import Tournament
+from shen.history import RatingHistory
 
 
 class RankingAlgo:
-    def __init__(self, name: str):
+    def __init__(self, name: str, checkpoint_interval: int = 32):
 
         # the name of the algorithm
         self.name: str = name
 
-    def start(self, tny: Tournament):
-        """Starts the algorithm."""
+        # the index of the match currently being processed
+        self.match_index: int = -1
+
+        # the number of matches between each saved state
+        self.checkpoint_interval: int = checkpoint_interval
+
+        # the saved states, keyed by the index of the next match to process
+        self.checkpoints: Dict[int, Any] = {}
+
+    def start(self, tny: Tournament) -> Optional[Leaderboard]:
+        """Starts the algorithm.
+
+        Returns:
+            Optional[Leaderboard]: the leaderboard generated, if any
+        """
 
         _i("Starting Ranking Algorithm...")
         _i("-" * 80)
@@ -66,44 +107,131 @@ class RankingAlgo:
         _i(f" # matches: {len(tny.matches)}")
         _i("-" * 80)
 
+        self.begin(tny)
+        self._replay(tny, 0)
+        return self.on_finish(tny)
+
+    def begin(self, tny: Tournament):
+        """Prepares the algorithm to read the matches of a tournament."""
+
         self.on_start(tny)
+        self.checkpoints = {0: self.save_state()}
 
-        for match in tny.matches:
-            self.on_match(match)
+    def step(self, index: int, match: Match, facts: MatchFacts):
+        """Reads the match at `index`, saving the state of the algorithm
+        beforehand every `checkpoint_interval` matches."""
 
-        self.on_finish(tny)
+        self.match_index = index
+        if index % self.checkpoint_interval == 0:
+            self.checkpoints[index] = self.save_state()
+
+        self.on_match(match, facts)
+
+    def update(self, tny: Tournament, index: int) -> Set[Any]:
+        """Recomputes the rankings after the matches from `index` onwards
+        were changed.
+
+        Only the matches after the nearest saved state before `index` are
+        processed again.
+
+        Args:
+            tny (Tournament): the tournament
+            index (int): the index of the earliest match changed
+
+        Returns:
+            Set[Any]: the UUIDs of the players whose ratings changed
+        """
+        saved = sorted(self.checkpoints)
+        start = saved[max(bisect_right(saved, index) - 1, 0)]
+
+        # the states after the edit are no longer valid
+        for i in saved:
+            if i > start:
+                del self.checkpoints[i]
+
+        before = self.save_state()
+        self.load_state(self.checkpoints[start], start)
+        self.on_update(tny)
+        self._replay(tny, start)
+
+        return self.compare_state(before)
+
+    def _replay(self, tny: Tournament, start: int):
+
+        for index in range(start, len(tny.matches)):
+            match = tny.matches[index]
+            self.step(index, match, match.get_facts())
+
+    def save_state(self) -> Any:
+        """Returns a snapshot of the state of the algorithm."""
+        return None
+
+    def load_state(self, state: Any, index: int):
+        """Restores a snapshot taken before the match `index`."""
+        pass
+
+    def compare_state(self, state: Any) -> Set[Any]:
+        """Returns the UUIDs of the players whose ratings differ between a
+        snapshot and the current state."""
+        return set()
 
     def on_start(self, tny: Tournament):
         """Called at the beginning of the algorithm."""
         pass
 
-    def on_match(self, match: Match):
+    def on_update(self, tny: Tournament):
+        """Called by `update` after a saved state is restored, before the
+        matches after it are read again."""
+        pass
+
+    def on_match(self, match: Match, facts: Optional[MatchFacts] = None):
         """Called at every match."""
         pass
 
-    def on_finish(self, tny: Tournament):
+    def on_finish(self, tny: Tournament) -> Optional[Leaderboard]:
         """Called after all matches have been processed."""
         pass
 
 
 class EloRankingAlgo(RankingAlgo):
-    def __init__(self):
+    def __init__(self, k: float = 40):
 
         RankingAlgo.__init__(self, "Elo Ranking System")
 
-        self.elo: Elo = Elo()
+        self.elo: Elo = Elo(k=k, kernel=True)
 
     def on_start(self, tny: Tournament):
 
         self.stats_dict = {}
 
+        # the rating history of every player
+        self.history: Dict[Any, RatingHistory] = {}
+
         # initialize all player's stats
         _i("initializing all players stats...")
 
-        for player in tny.players:
-            self.stats_dict[player.user.uuid] = {"rating": 1500, "matches": 0}
+        self._init_stats(tny.players)
 
-    def process_match(self, match: Match, player: Player):
+    def _init_stats(self, players: List[Player]):
+
+        # players can join after the algorithm started, i.e. when a late
+        # match is inserted; the dict is replaced rather than modified so the
+        # saved states are left as they were
+        missing = {
+            player.user.uuid: {"rating": 1500, "matches": 0, "wins": 0}
+            for player in players if player.user.uuid not in self.stats_dict
+        }
+
+        if missing:
+            self.stats_dict = {**self.stats_dict, **missing}
+
+        for uuid in missing:
+            self.history.setdefault(uuid, RatingHistory())
+
+    def process_match(self, match: Match, player: Player,
+                      facts: Optional[MatchFacts] = None):
+
+        facts = facts or match.get_facts()
 
         # get stats of this player
         stats = self.stats_dict.get(player.user.uuid, None)
@@ -111,11 +239,11 @@ class EloRankingAlgo(RankingAlgo):
         # get score of this player
         score = 0
         # _i(f"check: {match.get_winner()} == {player}")
-        if match.get_winner() == player:
+        if facts.winner == player:
             score = 1
 
         # get skill rating of opponent
-        for opponent in match.opponents_of(player):
+        for opponent in facts.opponents[player]:
             opp_stats = self.stats_dict.get(opponent.user.uuid, None)
             if not opp_stats:
                 _w("cannot find player.user: {opponent} !")
@@ -129,20 +257,56 @@ class EloRankingAlgo(RankingAlgo):
 
         return adj
 
-    def on_match(self, match: Match):
+    def on_match(self, match: Match, facts: Optional[MatchFacts] = None):
 
+        facts = facts or match.get_facts()
         adj_stats = {}
 
+        self._init_stats(match.players)
+
         for player in match.players:
-            adj = self.process_match(match, player)
+            adj = self.process_match(match, player, facts)
+            stats = self.stats_dict[player.user.uuid]
             adj_stats[player.user.uuid] = {
-                "rating": self.stats_dict[player.user.uuid]["rating"] + adj,
-                "matches": self.stats_dict[player.user.uuid]["matches"] + 1
+                "rating": stats["rating"] + adj,
+                "matches": stats["matches"] + 1,
+                "wins": stats["wins"] + (1 if facts.winner == player else 0)
             }
 
         # merge adjusted stats with originals
         self.stats_dict = {**self.stats_dict, **adj_stats}
 
+        # record the new ratings
+        for uuid, stats in adj_stats.items():
+            self.history.setdefault(uuid, RatingHistory()).append(
+                self.match_index, match.time, stats["rating"])
+
+    def save_state(self) -> Any:
+
+        # the stats of a player are never modified in place, so the dict
+        # itself is a snapshot
+        return self.stats_dict
+
+    def load_state(self, state: Any, index: int):
+
+        self.stats_dict = state
+
+        for history in self.history.values():
+            history.truncate(index)
+
+    def compare_state(self, state: Any) -> Set[Any]:
+
+        return {
+            uuid
+            for uuid, stats in self.stats_dict.items()
+            if uuid not in state or state[uuid]["rating"] != stats["rating"]
+        }
+
+    def on_update(self, tny: Tournament):
+
+        # players who joined since the saved state was taken
+        self._init_stats(tny.players)
+
     def on_finish(self, tny: Tournament):
 
         _i("finished reading matches.")
@@ -167,3 +331,60 @@ class EloRankingAlgo(RankingAlgo):
 
         for v in no_matches:
             _i(f"{tny.shn.user(v[0])}")
+
+        stat_list = []
+        for uuid, v in stats_list:
+            stats = Stats(tny.shn.user(uuid), rating=v["rating"])
+            stats.match_count = v["matches"]
+            stats.win_count = v["wins"]
+            stat_list.append(stats)
+
+        return Leaderboard(tny, stat_list,
+                           [tny.shn.user(v[0]) for v in no_matches])
+
+
+class CompositeRanker:
+    """
+    Runs many rankers in a single pass over the matches of a tournament.
+    """
+
+    def __init__(self, *rankers):
+        """
+        Args:
+            *rankers: the rankers to run, either `RankingAlgo` or
+                      `shen.elo.ranker.RankingMethod` objects
+        """
+        self.rankers: list = list(rankers)
+
+    def start(self, tny: Tournament) -> List[Optional[Leaderboard]]:
+        """
+        Run every ranker.
+
+        Returns:
+            List[Optional[Leaderboard]]: the leaderboard generated by each
+                                         ranker, in order
+        """
+        steps = []
+        for ranker in self.rankers:
+            if isinstance(ranker, RankingAlgo):
+                ranker.begin(tny)
+                steps.append(ranker.step)
+            else:
+                ranker.on_start(tny)
+                steps.append(_method_step(ranker))
+
+        for i, match in enumerate(tny.matches):
+            facts = match.get_facts()
+
+            for step in steps:
+                step(i, match, facts)
+
+        return [ranker.on_finish(tny) for ranker in self.rankers]
+
+
+def _method_step(method):
+    # adapts a RankingMethod to the signature of RankingAlgo.step
+    def step(index: int, match: Match, facts: MatchFacts):
+        method.on_match(match, facts)
+
+    return step
@@ -1,14 +1,17 @@
 from __future__ import annotations
-from typing import List, Type, TYPE_CHECKING
+from bisect import bisect_right
+from operator import attrgetter
+from typing import (Any, Dict, Hashable, List, Optional, Tuple, Type,
+                    TYPE_CHECKING)
 
 from shen.match import Match
 from shen.player import Player
+from shen.leaderboard import LeaderboardCache
 
 if TYPE_CHECKING:
     from shen import Shen
     from shen.user import User
     from shen.leaderboard import Leaderboard
-    from shen.elo.ranker import RankingMethod
 
 
 class Tournament:
@@ -30,20 +33,35 @@ class Tournament:
 
         self.players: List[Player] = []
 
+        # the players of this tournament by the UUID of their user
+        self._players_by_uuid: Dict[Any, Player] = {}
+
         self.matches: List[Match] = []
 
+        # incremented every time a player or match is added or changed
+        self.version: int = 0
+
+        # the leaderboards generated from this tournament
+        self.leaderboards: LeaderboardCache = LeaderboardCache()
+
+        # the ranking algorithms run by `generate_leaderboards`, with the
+        # index of the earliest match changed since each one last ran
+        self._rankers: Dict[Hashable, List[Any]] = {}
+
         for user in users:
             self.add_user(user)
 
     def _player(self, user: User):
         try:
-            return next(player for player in self.players
-                        if player.user == user)
-        except IndexError:
+            return self._players_by_uuid[user.uuid]
+        except KeyError:
             raise ValueError(f"the user {user} is not in this tournament")
 
     def add_user(self, user: User, nickname=None):
-        self.players.append(Player(user, self, nickname))
+        player = Player(user, self, nickname)
+        self.players.append(player)
+        self._players_by_uuid[user.uuid] = player
+        self._changed(len(self.matches))
 
     def start_match(self, users: List[User], best_of=3) -> Match:
         """
@@ -61,10 +79,201 @@ class Tournament:
         players = [self._player(user) for user in users]
 
         match = Match(self, players, best_of=best_of)
-        self.matches.append(match)
+        self._insert(match)
         return match
 
-    def generate_leaderboards(self,
-                              method_type: Type[RankingMethod]) -> Leaderboard:
-        method: RankingMethod = method_type()
-        return method.generate_leaderboards(self)
+    def start_matches(self, pairings: List[Tuple[User, ...]],
+                      best_of=3) -> List[Match]:
+        """
+        Create many new matches at once, i.e. from matchmaking.
+
+        Args:
+            pairings (List[Tuple[User, ...]]): the users in each match
+
+        Raises:
+            ValueError: if the users provided are not in the tournament
+
+        Returns:
+            List[Match]: the matches that were created
+        """
+        matches = [
+            Match(self, [self._player(user) for user in users],
+                  best_of=best_of) for users in pairings
+        ]
+
+        for match in matches:
+            self._insert(match)
+
+        return matches
+
+    def insert_match(self,
+                     users: List[User],
+                     winners: List[User],
+                     time: float,
+                     best_of=3) -> int:
+        """
+        Insert a finished match at its position in time.
+
+        Matches are kept ordered by time, so this can be used to record a
+        match that was reported late.
+
+        Args:
+            users (List[User]): the users in the match
+            winners (List[User]): the winner of each round of the match
+            time (float): the time the match took place
+
+        Raises:
+            ValueError: if the users provided are not in the tournament
+
+        Returns:
+            int: the index the match was inserted at
+        """
+        players = [self._player(user) for user in users]
+
+        match = Match(self, players, best_of=best_of, time=time)
+        for winner in winners:
+            match.record_win(winner)
+
+        return self._insert(match)
+
+    def amend_match(self,
+                    match: Match,
+                    winners: Optional[List[User]] = None,
+                    time: Optional[float] = None) -> int:
+        """
+        Correct the results or the time of a match.
+
+        Args:
+            match (Match): the match to correct
+            winners (Optional[List[User]]): the winner of each round of the
+                                            match, if the results changed
+            time (Optional[float]): the time the match took place, if it
+                                    changed
+
+        Raises:
+            ValueError: if the match is not in the tournament
+
+        Returns:
+            int: the index of the earliest match affected
+        """
+        index = self._index(match)
+
+        if winners is not None:
+            match.rounds = []
+            for winner in winners:
+                match.record_win(winner)
+
+        if time is not None and time != match.time:
+            del self.matches[index]
+            match.time = time
+            index = min(index, self._insert(match))
+
+        self._changed(index)
+        return index
+
+    def delete_match(self, match: Match) -> int:
+        """
+        Delete a match.
+
+        Args:
+            match (Match): the match to delete
+
+        Raises:
+            ValueError: if the match is not in the tournament
+
+        Returns:
+            int: the index the match was at
+        """
+        index = self._index(match)
+        del self.matches[index]
+        self._changed(index)
+        return index
+
+    def _index(self, match: Match) -> int:
+        # matches are compared by identity, since two matches can be equal
+        for i, other in enumerate(self.matches):
+            if other is match:
+                return i
+        raise ValueError("the match is not in this tournament")
+
+    def _insert(self, match: Match) -> int:
+        # every match goes through here, so matches stay ordered by time
+        index = bisect_right(self.matches, match.time, key=attrgetter("time"))
+        self.matches.insert(index, match)
+        self._changed(index)
+        return index
+
+    def _changed(self, index: int):
+        # the matches from `index` onwards were added or changed
+        self.version += 1
+        for ranker in self._rankers.values():
+            ranker[1] = min(ranker[1], index)
+
+    def _match_changed(self, match: Match):
+        # the results of a match changed; matches being played are usually
+        # the latest ones, so they are searched from the end
+        for i in range(len(self.matches) - 1, -1, -1):
+            if self.matches[i] is match:
+                self._changed(i)
+                return
+
+        # the match is not in this tournament yet
+        self._changed(len(self.matches))
+
+    def generate_leaderboards(self, method_type: Type,
+                              **params) -> Leaderboard:
+        """
+        Generate the leaderboards of this tournament.
+
+        Leaderboards are cached until the tournament changes, so calling this
+        again with the same arguments is cheap. Ranking algorithms are kept
+        between calls and updated with `RankingAlgo.update`, so after a
+        change only the matches from the earliest match changed are read
+        again.
+
+        Args:
+            method_type (Type): the ranking method to use, either a
+                                `RankingMethod` or a `RankingAlgo` type
+            **params: the arguments to create the ranking method with,
+                      i.e. `k=20`. They are part of the cache key, so they
+                      must be hashable.
+
+        Returns:
+            Leaderboard: the leaderboard generated
+
+        Raises:
+            TypeError: if a parameter is not hashable
+        """
+        key = (self.version, method_type, tuple(sorted(params.items())))
+
+        try:
+            hash(key)
+        except TypeError:
+            raise TypeError(
+                f"cannot cache leaderboards of {method_type.__name__}: "
+                f"parameters must be hashable, got {params}") from None
+
+        leaderboard = self.leaderboards.get(key)
+        if leaderboard is None:
+            ranker = self._rankers.get(key[1:])
+
+            if ranker is not None:
+                ranker[0].update(self, ranker[1])
+                leaderboard = ranker[0].on_finish(self)
+            else:
+                method = method_type(**params)
+
+                # ranking algorithms are started rather than asked for
+                # leaderboards, and kept to be updated later
+                if hasattr(method, "generate_leaderboards"):
+                    leaderboard = method.generate_leaderboards(self)
+                else:
+                    leaderboard = method.start(self)
+                    ranker = self._rankers[key[1:]] = [method, 0]
+
+            if ranker is not None:
+                ranker[1] = len(self.matches)
+
+            self.leaderboards.put(key, leaderboard)
+
+        return leaderboard
@@ -12,6 +12,7 @@ for the UUID.
 
 - The discriminator can only be a 4-digit number (ranging from 0000 to 9999).
 - The username is case-insensitive and can only contain letters, underscore, and dash.
+- Within a session, no two users with the same username share a discriminator.
 
 ### Nickname
 
@@ -26,6 +27,7 @@ behalf of this user.
 """
 
 import random
+from typing import Any, Dict
 from uuid import UUID, uuid4
 
 
@@ -43,6 +45,77 @@ def gen_uuid() -> UUID:
     return uuid4()
 
 
+class DiscriminatorPool:
+    """
+    The unused discriminators of a username.
+
+    Discriminators are drawn at random without replacement, so a new
+    discriminator never collides with one already taken and no retries are
+    needed, even when almost every discriminator of a username is taken.
+    """
+
+    def __init__(self):
+
+        # the number of unused discriminators
+        self.remaining: int = 10000
+
+        # the discriminators are kept in a virtual list of all 10000 numbers
+        # where the unused ones come first; only the positions that were
+        # swapped are stored
+        self._values: Dict[int, int] = {}
+        self._positions: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self.remaining
+
+    def _remove(self, value: int):
+        position = self._positions.get(value, value)
+        last = self.remaining - 1
+        last_value = self._values.get(last, last)
+
+        # swap the value with the last unused one
+        self._values[position] = last_value
+        self._positions[last_value] = position
+        self._values[last] = value
+        self._positions[value] = last
+
+        self.remaining -= 1
+
+    def is_free(self, discriminator: str) -> bool:
+        value = int(discriminator)
+        return self._positions.get(value, value) < self.remaining
+
+    def take(self) -> str:
+        """
+        Take a random unused discriminator.
+
+        Raises:
+            ValueError: if every discriminator is taken
+
+        Returns:
+            str: the discriminator
+        """
+        if self.remaining == 0:
+            raise ValueError("every discriminator is taken")
+
+        position = random.randrange(self.remaining)
+        value = self._values.get(position, position)
+        self._remove(value)
+        return '{:04d}'.format(value)
+
+    def reserve(self, discriminator: str):
+        """
+        Take a specific discriminator.
+
+        Raises:
+            ValueError: if the discriminator is already taken
+        """
+        if not self.is_free(discriminator):
+            raise ValueError(f"the discriminator {discriminator} is taken")
+
+        self._remove(int(discriminator))
+
+
 class User:
     def __init__(self,
                  username: str,
@@ -61,6 +134,9 @@ class User:
 
         self.nickname: str = nickname or username
 
+        # the IDs of this user on other services, i.e. {"discord": ...}
+        self.connections: Dict[str, Any] = {}
+
     def get_tag(self) -> str:
         return self.username + '#' + self.discriminator
 
@@ -0,0 +1,356 @@
+"""
+Windowed Rankings
+=================
+
+Windowed rankings only count recent play. They are kept up to date
+incrementally as matches are read: old matches leave the window as new
+ones enter it, so the whole tournament never has to be ranked again.
+
+Once started, matches added to the end of the tournament are read with
+`update()` (or one at a time with `add_match()`). Only corrections to
+matches that were already read restart the window.
+
+Every match still adjusts each player's Elo rating as usual. The rating
+shown on a windowed leaderboard, however, is the initial rating (1500)
+plus only the adjustments that are inside the window.
+
+### Sliding Window
+
+Only the matches from the last `days` days count. Times are taken from
+`Match.time`, and the window ends at the time of the latest match read
+(or the time given to `expire()`).
+
+### Last Matches
+
+Only the last `n` matches of each player count.
+
+### Time Decay
+
+Every match counts, but the adjustment from a match is halved every
+`half_life` days, so older matches count less and less.
+"""
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+from shen import _i
+from shen.elo import Elo
+from shen.elo.ranker import Stats
+from shen.leaderboard import Leaderboard
+from shen.match import Match, MatchFacts
+from shen.ranker import RankingAlgo
+from shen.tournament import Tournament
+
+# the number of seconds in a day
+DAY = 24 * 60 * 60
+
+
+class WindowedRankingAlgo(RankingAlgo):
+    """
+    The base of the windowed ranking algorithms.
+
+    Subclasses decide which rating adjustments are inside the window.
+    """
+
+    def __init__(self, name: str, k: float = 40):
+
+        RankingAlgo.__init__(self, name)
+
+        self.elo: Elo = Elo(k=k, kernel=True)
+
+    def on_start(self, tny: Tournament):
+
+        # the Elo rating of every player, used to calculate adjustments
+        self.ratings: Dict[Any, int] = {}
+
+        # the time of the latest match read
+        self.now: float = -math.inf
+
+        # the number of matches read
+        self.read: int = 0
+
+        for player in tny.players:
+            self.ratings[player.user.uuid] = 1500
+
+    def on_match(self, match: Match, facts: Optional[MatchFacts] = None):
+
+        facts = facts or match.get_facts()
+        adjustments: Dict[Any, int] = {}
+
+        for player in match.players:
+            score = 1 if facts.winner == player else 0
+            rating = self.ratings.setdefault(player.user.uuid, 1500)
+
+            for opponent in facts.opponents[player]:
+                opp_rating = self.ratings.setdefault(opponent.user.uuid, 1500)
+
+            adjustments[player.user.uuid] = math.ceil(
+                self.elo.get_adjustment(rating, opp_rating, score))
+
+        for uuid, adj in adjustments.items():
+            self.ratings[uuid] += adj
+
+        winner = facts.winner.user.uuid if facts.winner else None
+
+        self.now = max(self.now, match.time)
+        self.read += 1
+        self.on_enter(match.time, adjustments, winner)
+        self.expire(self.now)
+
+    def add_match(self, match: Match):
+        """Reads a match played after every match read so far, i.e. a match
+        just added to the end of the tournament."""
+        self.step(self.read, match, match.get_facts())
+
+    def on_enter(self, time: float, adjustments: Dict[Any, int],
+                 winner: Optional[Any]):
+        """Called when the adjustments of a match (and the UUID of its
+        winner) enter the window."""
+        pass
+
+    def expire(self, now: float):
+        """Removes everything that has left the window by the time `now`."""
+        pass
+
+    def get_rating(self, uuid: Any) -> Optional[int]:
+        """Gets the windowed rating of a player, or None if the player has no
+        matches inside the window."""
+        return None
+
+    def get_match_count(self, uuid: Any) -> int:
+        """Gets the number of matches of a player inside the window."""
+        return 0
+
+    def get_win_count(self, uuid: Any) -> int:
+        """Gets the number of matches won by a player inside the window."""
+        return 0
+
+    def update(self, tny: Tournament, index: int) -> Set[Any]:
+
+        before = {uuid: self.get_rating(uuid) for uuid in self.ratings}
+
+        if index < self.read:
+            # windows do not keep the history needed to rewind, so
+            # corrections restart the window
+            self.on_start(tny)
+            self._replay(tny, 0)
+        else:
+            # only the new matches enter the window
+            for player in tny.players:
+                self.ratings.setdefault(player.user.uuid, 1500)
+
+            self._replay(tny, self.read)
+            self.expire(self.now)
+
+        return {
+            uuid
+            for uuid in self.ratings
+            if before.get(uuid) != self.get_rating(uuid)
+        }
+
+    def on_finish(self, tny: Tournament) -> Leaderboard:
+
+        _i("finished reading matches.")
+
+        stat_list = []
+        no_matches = []
+        for uuid in self.ratings:
+            rating = self.get_rating(uuid)
+            if rating is None:
+                no_matches.append(tny.shn.user(uuid))
+                continue
+
+            stats = Stats(tny.shn.user(uuid), rating=rating)
+            stats.match_count = self.get_match_count(uuid)
+            stats.win_count = self.get_win_count(uuid)
+            stat_list.append(stats)
+
+        stat_list.sort(key=lambda stats: stats.meta["rating"], reverse=True)
+
+        for place, stats in enumerate(stat_list, 1):
+            _i(f"{place}: {tny._player(stats.user)} ({stats.meta['rating']})")
+
+        return Leaderboard(tny, stat_list, no_matches)
+
+
+class SlidingWindowAlgo(WindowedRankingAlgo):
+    """
+    Ranks players using only the matches from the last `days` days.
+    """
+
+    def __init__(self, days: float, k: float = 40):
+
+        WindowedRankingAlgo.__init__(self, f"Elo Ranking (last {days} days)",
+                                     k)
+
+        self.days: float = days
+
+    def on_start(self, tny: Tournament):
+
+        WindowedRankingAlgo.on_start(self, tny)
+
+        # the adjustments inside the window as (time, adjustments, winner),
+        # oldest first
+        self.window: Deque[Tuple[float, Dict[Any, int], Any]] = deque()
+
+        # the sum of the adjustments, the number of matches and the number
+        # of wins of each player inside the window
+        self.sums: Dict[Any, int] = {}
+        self.counts: Dict[Any, int] = {}
+        self.wins: Dict[Any, int] = {}
+
+    def on_enter(self, time: float, adjustments: Dict[Any, int],
+                 winner: Optional[Any]):
+
+        self.window.append((time, adjustments, winner))
+
+        for uuid, adj in adjustments.items():
+            self.sums[uuid] = self.sums.get(uuid, 0) + adj
+            self.counts[uuid] = self.counts.get(uuid, 0) + 1
+
+        if winner is not None:
+            self.wins[winner] = self.wins.get(winner, 0) + 1
+
+    def expire(self, now: float):
+
+        self.now = max(self.now, now)
+        cutoff = self.now - self.days * DAY
+
+        while self.window and self.window[0][0] < cutoff:
+            _, adjustments, winner = self.window.popleft()
+
+            if winner is not None:
+                self.wins[winner] -= 1
+
+            for uuid, adj in adjustments.items():
+                self.counts[uuid] -= 1
+                if self.counts[uuid] == 0:
+                    del self.counts[uuid]
+                    del self.sums[uuid]
+                else:
+                    self.sums[uuid] -= adj
+
+    def get_rating(self, uuid: Any) -> Optional[int]:
+        if uuid not in self.sums:
+            return None
+        return 1500 + self.sums[uuid]
+
+    def get_match_count(self, uuid: Any) -> int:
+        return self.counts.get(uuid, 0)
+
+    def get_win_count(self, uuid: Any) -> int:
+        return self.wins.get(uuid, 0)
+
+
+class LastMatchesAlgo(WindowedRankingAlgo):
+    """
+    Ranks players using only the last `n` matches of each player.
+    """
+
+    def __init__(self, n: int, k: float = 40):
+
+        WindowedRankingAlgo.__init__(self, f"Elo Ranking (last {n} matches)",
+                                     k)
+
+        self.n: int = n
+
+    def on_start(self, tny: Tournament):
+
+        WindowedRankingAlgo.on_start(self, tny)
+
+        # the last `n` (adjustment, won) of each player, the sum of the
+        # adjustments and the number of wins
+        self.windows: Dict[Any, Deque[Tuple[int, bool]]] = {}
+        self.sums: Dict[Any, int] = {}
+        self.wins: Dict[Any, int] = {}
+
+    def on_enter(self, time: float, adjustments: Dict[Any, int],
+                 winner: Optional[Any]):
+
+        for uuid, adj in adjustments.items():
+            window = self.windows.get(uuid)
+            if window is None:
+                window = self.windows[uuid] = deque(maxlen=self.n)
+                self.sums[uuid] = 0
+                self.wins[uuid] = 0
+
+            # the oldest adjustment is pushed out of a full window
+            if len(window) == self.n:
+                old_adj, old_won = window[0]
+                self.sums[uuid] -= old_adj
+                self.wins[uuid] -= old_won
+
+            won = uuid == winner
+            window.append((adj, won))
+            self.sums[uuid] += adj
+            self.wins[uuid] += won
+
+    def get_rating(self, uuid: Any) -> Optional[int]:
+        if uuid not in self.sums:
+            return None
+        return 1500 + self.sums[uuid]
+
+    def get_match_count(self, uuid: Any) -> int:
+        window = self.windows.get(uuid)
+        return len(window) if window else 0
+
+    def get_win_count(self, uuid: Any) -> int:
+        return self.wins.get(uuid, 0)
+
+
+class DecayedEloAlgo(WindowedRankingAlgo):
+    """
+    Ranks players using every match, with the adjustment of each match
+    halved every `half_life` days.
+    """
+
+    def __init__(self, half_life: float, k: float = 40):
+
+        WindowedRankingAlgo.__init__(
+            self, f"Elo Ranking (half-life of {half_life} days)", k)
+
+        self.half_life: float = half_life
+
+    def on_start(self, tny: Tournament):
+
+        WindowedRankingAlgo.on_start(self, tny)
+
+        # the decayed sum of the adjustments of each player as of the time
+        # of their latest match, and that time
+        self.sums: Dict[Any, Tuple[float, float]] = {}
+
+        # the number of matches and wins of each player
+        self.counts: Dict[Any, int] = {}
+        self.wins: Dict[Any, int] = {}
+
+    def _decay(self, value: float, elapsed: float) -> float:
+        return value * 0.5**(elapsed / (self.half_life * DAY))
+
+    def on_enter(self, time: float, adjustments: Dict[Any, int],
+                 winner: Optional[Any]):
+
+        for uuid, adj in adjustments.items():
+            value, then = self.sums.get(uuid, (0.0, time))
+            self.sums[uuid] = (self._decay(value, time - then) + adj, time)
+            self.counts[uuid] = self.counts.get(uuid, 0) + 1
+
+        if winner is not None:
+            self.wins[winner] = self.wins.get(winner, 0) + 1
+
+    def expire(self, now: float):
+
+        # nothing is removed, but the ratings decay up to the time `now`
+        self.now = max(self.now, now)
+
+    def get_rating(self, uuid: Any) -> Optional[int]:
+        if uuid not in self.sums:
+            return None
+        value, then = self.sums[uuid]
+        return 1500 + round(self._decay(value, max(self.now - then, 0)))
+
+    def get_match_count(self, uuid: Any) -> int:
+        return self.counts.get(uuid, 0)
+
+    def get_win_count(self, uuid: Any) -> int:
+        return self.wins.get(uuid, 0)
@@ -0,0 +1,41 @@
+"""
+Compares the scalar path of `shen.elo.Elo` with kernel mode.
+
+Run with `python -m test.bench_elo` from the repository root.
+"""
+
+import random
+import timeit
+
+from shen.elo import Elo, _kernel_tables
+
+N = 100000
+
+random.seed(0)
+pairs = [(random.randint(1000, 2000), random.randint(1000, 2000),
+          random.randint(0, 1)) for _ in range(N)]
+
+scalar = Elo()
+kernel = Elo(kernel=True)
+
+# kernel mode must give the same results
+for a, b, score in pairs:
+    assert scalar.get_adjustment(a, b, score) == kernel.get_adjustment(
+        a, b, score)
+
+
+def run(elo: Elo):
+    adj = elo.get_adjustment
+    for a, b, score in pairs:
+        adj(a, b, score)
+
+
+setup = timeit.timeit(lambda: _kernel_tables.__wrapped__(40, 4000),
+                      number=10) / 10
+t_scalar = min(timeit.repeat(lambda: run(scalar), number=1, repeat=5))
+t_kernel = min(timeit.repeat(lambda: run(kernel), number=1, repeat=5))
+
+print(f"{N} adjustments")
+print(f"  scalar: {t_scalar * 1000:8.2f} ms")
+print(f"  kernel: {t_kernel * 1000:8.2f} ms ({t_scalar / t_kernel:.2f}x)")
+print(f"  tables: {setup * 1000:8.2f} ms to build")
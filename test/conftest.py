@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+import shen
+
+
+@pytest.fixture
+def make_tournament():
+    """Creates a tournament with `n_users` users and `n_matches` random,
+    finished matches, one day apart."""
+
+    def make(n_users=8, n_matches=100, seed=0):
+        rng = random.Random(seed)
+
+        shn = shen.init()
+        users = [shn.create_user(f"user{i}") for i in range(n_users)]
+        tny = shn.create_tournament("test", users)
+
+        for i in range(n_matches):
+            a, b = rng.sample(users, 2)
+            winner = rng.choice([a, b])
+            tny.insert_match([a, b], [winner, winner], time=i * 86400.0)
+
+        return shn, tny
+
+    return make
@@ -0,0 +1,21 @@
+import random
+
+import pytest
+
+from shen.elo import Elo
+
+
+@pytest.mark.parametrize("k", [40, 32, 16.5])
+def test_kernel_is_identical_to_scalar(k):
+    rng = random.Random(k)
+    scalar, kernel = Elo(k=k), Elo(k=k, kernel=True)
+
+    for _ in range(20000):
+        a = rng.randint(0, 6000)
+        b = rng.choice([rng.randint(0, 6000), rng.randint(0, 6000) + 0.5])
+        score = rng.choice([0, 1, 0.5, 1.0])
+
+        assert kernel.get_expected_score(a, b) == scalar.get_expected_score(
+            a, b)
+        assert kernel.get_adjustment(a, b, score) == scalar.get_adjustment(
+            a, b, score)
@@ -0,0 +1,34 @@
+from shen.history import RatingHistory
+
+
+def make_history():
+    history = RatingHistory()
+    for i, (time, rating) in enumerate([(1.5, 1520), (2.25, 1499),
+                                        (7.0, 1530), (9.125, 1510)]):
+        history.append(i * 2, time, rating)
+    return history
+
+
+def test_range_queries():
+    history = make_history()
+
+    assert history.between(2, 7) == [(2, 2.25, 1499), (4, 7.0, 1530)]
+    assert history.between(10, 20) == []
+    assert history.rating_at(1.0) is None
+    assert history.rating_at(8.0) == 1530
+    assert history.latest() == 1510
+
+
+def test_truncate():
+    history = make_history()
+    history.truncate(3)
+
+    assert list(history) == [(0, 1.5, 1520), (2, 2.25, 1499)]
+
+
+def test_encode_round_trip():
+    history = make_history()
+    encoded = history.encode()
+
+    assert encoded["ratings"] == [1520, -21, 31, -20]
+    assert list(RatingHistory.decode(encoded)) == list(history)
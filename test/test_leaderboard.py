@@ -0,0 +1,80 @@
+import pytest
+
+from shen.leaderboard import LeaderboardPublisher
+from shen.ranker import EloRankingAlgo
+
+
+def key(delta):
+    return (sorted((u.uuid, a, b) for u, a, b in delta.moved),
+            sorted((u.uuid, a, b) for u, a, b in delta.rated),
+            sorted(u.uuid for u in delta.entered),
+            sorted(u.uuid for u in delta.left_no_matches),
+            sorted(u.uuid for u in delta.left))
+
+
+@pytest.fixture
+def ranked(make_tournament):
+    shn, tny = make_tournament(n_users=12, n_matches=60)
+
+    # a player that has not played yet
+    newbie = shn.create_user("newbie")
+    tny.add_user(newbie)
+
+    algo = EloRankingAlgo()
+    return shn, tny, algo, algo.start(tny), newbie
+
+
+@pytest.mark.parametrize("index", [0, 20, 59])
+def test_targeted_diff_matches_full_diff(ranked, index):
+    shn, tny, algo, old, newbie = ranked
+
+    match = tny.matches[index]
+    loser = next(p for p in match.players if p != match.get_winner()).user
+    changed = algo.update(tny, tny.amend_match(match, winners=[loser, loser]))
+    new = algo.on_finish(tny)
+
+    delta = new.diff(old, changed)
+    assert delta
+    assert key(delta) == key(new.diff(old))
+
+
+def test_new_player_leaves_no_matches(ranked):
+    shn, tny, algo, old, newbie = ranked
+    a = tny.players[0].user
+
+    changed = algo.update(tny, tny.insert_match([newbie, a], [newbie, newbie],
+                                                time=30.5 * 86400))
+    new = algo.on_finish(tny)
+    delta = new.diff(old, changed)
+
+    assert [u.uuid for u in delta.entered] == [newbie.uuid]
+    assert [u.uuid for u in delta.left_no_matches] == [newbie.uuid]
+    assert key(delta) == key(new.diff(old))
+
+
+def test_publisher_only_emits_changes(ranked):
+    shn, tny, algo, old, newbie = ranked
+    published = []
+
+    publisher = LeaderboardPublisher(old)
+    publisher.subscribe(published.append)
+
+    assert not publisher.publish(algo.on_finish(tny), set())
+    assert published == []
+
+    changed = algo.update(tny, tny.delete_match(tny.matches[5]))
+    publisher.publish(algo.on_finish(tny), changed)
+    assert len(published) == 1
+
+
+def test_first_publication_is_from_version_0(ranked):
+    shn, tny, algo, old, newbie = ranked
+    published = []
+
+    publisher = LeaderboardPublisher()
+    publisher.subscribe(published.append)
+    publisher.publish(old)
+
+    delta, = published
+    assert (delta.from_version, delta.to_version) == (0, tny.version)
+    assert len(delta.entered) == len(old)
@@ -0,0 +1,53 @@
+import random
+
+import shen
+from shen.matchmaking import MatchmakingQueue
+
+
+def make_queue(n, **kwargs):
+    shn = shen.init()
+    users = [shn.create_user(f"user{i}") for i in range(n)]
+    tny = shn.create_tournament("ladder", users)
+    return users, tny, MatchmakingQueue(tny, **kwargs)
+
+
+def test_pairs_nearest_ratings():
+    (a, b, c), tny, queue = make_queue(3)
+    queue.enqueue(a, 1000)
+    queue.enqueue(b, 1040)
+    queue.enqueue(c, 1041)
+
+    assert queue.pair() == [(b, c)]
+    assert a in queue
+
+
+def test_rematch_allowed_once_window_is_at_max():
+    (a, b), tny, queue = make_queue(2)
+    queue.enqueue(a, 1500)
+    queue.enqueue(b, 1510)
+    assert queue.pair() == [(a, b)]
+
+    queue.enqueue(a, 1500)
+    queue.enqueue(b, 1510)
+    rounds = 1
+    while not queue.pair():
+        rounds += 1
+        assert rounds < 50
+
+    # the window starts at 50 and widens by 25 up to 400
+    assert rounds == 15
+
+
+def test_large_queue_starts_matches():
+    rng = random.Random(0)
+    users, tny, queue = make_queue(2000)
+    for user in users:
+        queue.enqueue(user, rng.randint(800, 2200))
+
+    matches = queue.start_matches()
+
+    assert len(matches) * 2 + len(queue) == 2000
+    assert len(tny.matches) == len(matches)
+    for match in matches:
+        a, b = match.players
+        assert a.user not in queue and b.user not in queue
@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from parser import parse_files
+
+EXPORT = os.path.join(os.path.dirname(__file__), "..",
+                      "club-shen-export.json")
+
+
+def summary(shn):
+    return {
+        tny_id: [([p.user.uuid for p in match.players],
+                  [p.user.uuid for p in match.get_all_winners()])
+                 for match in tny.matches]
+        for tny_id, tny in shn.tournaments.items()
+    }
+
+
+@pytest.fixture
+def files(tmp_path):
+    """Writes two small exports that share a user and a match."""
+
+    def write(name, users, matches):
+        path = tmp_path / name
+        path.write_text(
+            json.dumps({
+                "users": users,
+                "players": {
+                    "s1": {uuid: {"nickname": uuid} for uuid in users}
+                },
+                "matches": matches,
+            }))
+        return str(path)
+
+    a = write(
+        "a.json", {
+            "ann": {"nickname": "Ann", "discord": "<@!101>"},
+            "bob": {"displayName": "Bob"},
+        }, {
+            "m1": {"players": ["ann", "bob"], "games": [{"winner": 0}]},
+            "m2": {"players": ["bob", "ann"], "games": [{"winner": 0}]},
+        })
+    b = write(
+        "b.json", {
+            "bob": {"displayName": "Bob"},
+            "cat": {"displayName": "Cat", "discord": "!102"},
+        }, {
+            "m2": {"players": ["bob", "ann"], "games": [{"winner": 0}]},
+            "m3": {"players": ["cat", "bob"], "games": [{"winner": 1}]},
+        })
+    return a, b
+
+
+def test_overlapping_files_are_merged(files):
+    shn = parse_files(list(files), processes=1)
+
+    assert sorted(shn.users) == ["ann", "bob", "cat"]
+    assert len(shn.tournaments["s1"].matches) == 3
+    assert shn.user_by_connection("discord", "101") is shn.user("ann")
+    assert shn.user_by_connection("discord", "102") is shn.user("cat")
+
+
+def test_parallel_import_is_the_same_as_serial(files):
+    serial = parse_files(list(files), processes=1)
+    parallel = parse_files(list(files), processes=2)
+
+    assert summary(parallel) == summary(serial)
+
+
+def test_importing_a_file_twice_is_idempotent():
+    once = parse_files([EXPORT])
+    twice = parse_files([EXPORT, EXPORT], processes=1)
+
+    assert len(twice.tournaments["ssb4-s2016"].matches) == 121
+    assert summary(twice) == summary(once)
@@ -0,0 +1,142 @@
+import pytest
+
+from shen.elo.ranker import RankingMethod
+from shen.matchmaking import MatchmakingQueue
+from shen.ranker import CompositeRanker, EloRankingAlgo
+
+
+def ratings(lb):
+    return [(stats.user.uuid, stats.meta["rating"], stats.match_count,
+             stats.win_count) for stats in lb._stat_list]
+
+
+def fresh(tny):
+    algo = EloRankingAlgo()
+    algo.start(tny)
+    return algo
+
+
+def assert_same(algo, tny):
+    expected = fresh(tny)
+
+    assert algo.stats_dict == expected.stats_dict
+
+    lb, expected_lb = algo.on_finish(tny), expected.on_finish(tny)
+    assert ratings(lb) == ratings(expected_lb)
+    assert ([user.uuid for user in lb.no_matches
+             ] == [user.uuid for user in expected_lb.no_matches])
+    for uuid, history in expected.history.items():
+        assert list(algo.history[uuid]) == list(history)
+
+
+@pytest.mark.parametrize("index", [0, 5, 31, 32, 33, 70, 99])
+def test_update_after_amend_matches_fresh_start(make_tournament, index):
+    shn, tny = make_tournament()
+    algo = fresh(tny)
+
+    match = tny.matches[index]
+    loser = next(p for p in match.players if p != match.get_winner()).user
+    changed = algo.update(tny, tny.amend_match(match, winners=[loser, loser]))
+
+    assert changed
+    assert_same(algo, tny)
+
+
+def test_update_after_insert_and_delete_matches_fresh_start(make_tournament):
+    shn, tny = make_tournament()
+    algo = fresh(tny)
+
+    a, b = tny.players[0].user, tny.players[1].user
+    algo.update(tny, tny.insert_match([a, b], [b, b], time=40.5 * 86400))
+    assert_same(algo, tny)
+
+    algo.update(tny, tny.delete_match(tny.matches[10]))
+    assert_same(algo, tny)
+
+    algo.update(tny, tny.amend_match(tny.matches[90], time=-1.0))
+    assert_same(algo, tny)
+
+
+def test_update_with_player_who_joined_after_start(make_tournament):
+    shn, tny = make_tournament()
+    algo = fresh(tny)
+
+    late = shn.create_user("late")
+    tny.add_user(late)
+    a = tny.players[0].user
+
+    changed = algo.update(tny, tny.insert_match([a, late], [late, late],
+                                                time=50.5 * 86400))
+
+    assert late.uuid in changed and a.uuid in changed
+    assert_same(algo, tny)
+
+
+def test_update_with_player_who_joined_without_matches(make_tournament):
+    shn, tny = make_tournament()
+    algo = fresh(tny)
+
+    late = shn.create_user("late")
+    tny.add_user(late)
+    a, b = tny.players[0].user, tny.players[1].user
+
+    changed = algo.update(tny, tny.insert_match([a, b], [a, a],
+                                                time=50.5 * 86400))
+
+    assert late.uuid in changed
+    assert_same(algo, tny)
+
+
+def test_update_without_changes_reports_nothing(make_tournament):
+    shn, tny = make_tournament()
+    algo = fresh(tny)
+
+    assert algo.update(tny, 40) == set()
+
+
+
+def test_composite_matches_separate_runs(make_tournament):
+    shn, tny = make_tournament()
+
+    elo, method = CompositeRanker(EloRankingAlgo(),
+                                  RankingMethod()).start(tny)
+
+    assert ratings(elo) == ratings(fresh(tny).on_finish(tny))
+    assert ratings(method) == ratings(RankingMethod().generate_leaderboards(tny))
+
+
+def test_composite_saves_checkpoints(make_tournament):
+    shn, tny = make_tournament()
+    algo = EloRankingAlgo()
+    CompositeRanker(algo).start(tny)
+
+    assert sorted(algo.checkpoints) == [0, 32, 64, 96]
+    algo.update(tny, tny.delete_match(tny.matches[40]))
+    assert_same(algo, tny)
+
+
+def test_win_count(make_tournament):
+    shn, tny = make_tournament()
+    lb = fresh(tny).on_finish(tny)
+
+    for stats in lb._stat_list:
+        player = tny._player(stats.user)
+        assert stats.win_count == sum(
+            match.get_winner() == player for match in tny.matches)
+
+
+def test_matches_in_progress_count_as_losses(make_tournament):
+    shn, tny = make_tournament(n_matches=10)
+    a, b = tny.players[0].user, tny.players[1].user
+    before = fresh(tny).stats_dict
+
+    tny.start_match([a, b])
+    queue = MatchmakingQueue(tny)
+    for player in tny.players[2:]:
+        queue.enqueue(player.user)
+    queue.start_matches()
+
+    stats = fresh(tny).stats_dict
+    assert stats[a.uuid]["matches"] == before[a.uuid]["matches"] + 1
+    assert stats[a.uuid]["wins"] == before[a.uuid]["wins"]
+    assert tny.generate_leaderboards(EloRankingAlgo) is not None
@@ -0,0 +1,64 @@
+import pytest
+
+from shen.elo.ranker import RankingMethod
+from shen.ranker import EloRankingAlgo
+
+
+def times(tny):
+    return [match.time for match in tny.matches]
+
+
+def test_matches_stay_ordered_by_time(make_tournament):
+    shn, tny = make_tournament(n_matches=10)
+    a, b = tny.players[0].user, tny.players[1].user
+
+    tny.insert_match([a, b], [a], time=1e12)
+    tny.start_match([a, b])
+    tny.start_matches([(a, b), (b, a)])
+    tny.insert_match([a, b], [b], time=3.5 * 86400)
+
+    assert times(tny) == sorted(times(tny))
+
+
+def test_leaderboards_are_cached_until_a_write(make_tournament):
+    shn, tny = make_tournament(n_matches=10)
+
+    lb = tny.generate_leaderboards(RankingMethod)
+    assert tny.generate_leaderboards(RankingMethod) is lb
+    assert tny.generate_leaderboards(RankingMethod, k=20) is not lb
+    assert tny.generate_leaderboards(EloRankingAlgo) is not lb
+    assert len(tny.leaderboards) == 3
+
+    tny.matches[0].record_win(tny.matches[0].players[0].user)
+    new = tny.generate_leaderboards(RankingMethod)
+    assert new is not lb
+
+    # the leaderboards of the older version are dropped
+    assert len(tny.leaderboards) == 1
+    assert tny.generate_leaderboards(RankingMethod) is new
+
+
+def test_unhashable_parameters_are_rejected(make_tournament):
+    shn, tny = make_tournament(n_matches=10)
+
+    with pytest.raises(TypeError, match="hashable"):
+        tny.generate_leaderboards(RankingMethod, k=[20])
+
+
+def test_generated_leaderboards_follow_changes(make_tournament):
+    shn, tny = make_tournament(n_matches=80)
+    tny.generate_leaderboards(EloRankingAlgo)
+
+    match = tny.matches[40]
+    loser = next(p for p in match.players if p != match.get_winner()).user
+    tny.amend_match(match, winners=[loser, loser])
+    tny.add_user(shn.create_user("late"))
+    tny.start_match([tny.players[0].user,
+                     tny.players[1].user]).record_win(tny.players[1].user)
+
+    lb = tny.generate_leaderboards(EloRankingAlgo)
+    expected = EloRankingAlgo().start(tny)
+
+    assert [(s.user.uuid, s.meta["rating"]) for s in lb._stat_list
+            ] == [(s.user.uuid, s.meta["rating"]) for s in expected._stat_list]
+    assert len(lb.no_matches) == len(expected.no_matches) == 1
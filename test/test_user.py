@@ -0,0 +1,55 @@
+import pytest
+
+import shen
+from shen.user import DiscriminatorPool, User
+
+
+def test_pool_hands_out_every_discriminator_once():
+    pool = DiscriminatorPool()
+    pool.reserve("0042")
+
+    taken = {pool.take() for _ in range(9999)}
+
+    assert len(taken) == 9999 and "0042" not in taken
+    with pytest.raises(ValueError):
+        pool.take()
+
+
+def test_pool_rejects_taken_discriminator():
+    pool = DiscriminatorPool()
+    pool.reserve("1234")
+
+    assert not pool.is_free("1234")
+    with pytest.raises(ValueError):
+        pool.reserve("1234")
+
+
+def test_common_names_get_unique_tags():
+    shn = shen.init()
+    users = [shn.create_user("Bob") for _ in range(5000)]
+
+    assert len({user.get_tag().casefold() for user in users}) == 5000
+
+
+def test_lookup_by_tag_and_connection():
+    shn = shen.init()
+    user = shn.create_user("Bob")
+
+    assert shn.user_by_tag(user.get_tag().upper()) is user
+
+    shn.connect(user, "discord", "123")
+    assert shn.user_by_connection("discord", "123") is user
+
+    other = shn.create_user("Alice")
+    with pytest.raises(ValueError):
+        shn.connect(other, "discord", "123")
+
+
+def test_colliding_tag_is_reassigned():
+    shn = shen.init()
+    user = shn.create_user("Bob")
+
+    other = shn.add_user(User("bob", user.discriminator))
+
+    assert other.discriminator != user.discriminator
+    assert shn.user_by_tag(other.get_tag()) is other
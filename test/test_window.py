@@ -0,0 +1,139 @@
+import pytest
+
+from shen.ranker import CompositeRanker, EloRankingAlgo
+from shen.window import (DAY, DecayedEloAlgo, LastMatchesAlgo,
+                         SlidingWindowAlgo)
+
+
+def ratings(lb):
+    return sorted((stats.user.uuid, stats.meta["rating"], stats.match_count,
+                   stats.win_count) for stats in lb._stat_list)
+
+
+def test_unbounded_windows_match_elo(make_tournament):
+    shn, tny = make_tournament()
+
+    elo, sliding, last, decayed = CompositeRanker(
+        EloRankingAlgo(), SlidingWindowAlgo(1e9), LastMatchesAlgo(10**6),
+        DecayedEloAlgo(1e12)).start(tny)
+
+    assert ratings(elo) == ratings(sliding) == ratings(last) == ratings(
+        decayed)
+
+
+def test_last_matches_matches_history(make_tournament):
+    shn, tny = make_tournament()
+
+    elo = EloRankingAlgo()
+    elo.start(tny)
+    lb = LastMatchesAlgo(5).start(tny)
+
+    for stats in lb._stat_list:
+        history = [1500] + list(elo.history[stats.user.uuid].ratings)
+        assert stats.meta["rating"] == 1500 + history[-1] - history[-6]
+        assert stats.match_count == 5
+
+
+def test_sliding_window_matches_history(make_tournament):
+    shn, tny = make_tournament()
+
+    elo = EloRankingAlgo()
+    elo.start(tny)
+    algo = SlidingWindowAlgo(20)
+    lb = algo.start(tny)
+
+    cutoff = tny.matches[-1].time - 20 * DAY
+    for stats in lb._stat_list:
+        history = elo.history[stats.user.uuid]
+        before = history.rating_at(cutoff - 1) or 1500
+        assert stats.meta["rating"] == 1500 + history.latest() - before
+
+    # every match eventually leaves the window
+    algo.expire(algo.now + 21 * DAY)
+    assert not algo.window and not algo.sums
+
+
+def test_decay_halves_with_time(make_tournament):
+    shn, tny = make_tournament()
+
+    algo = DecayedEloAlgo(7)
+    algo.start(tny)
+    uuid = tny.matches[-1].players[0].user.uuid
+    value, then = algo.sums[uuid]
+
+    algo.expire(then + 7 * DAY)
+    assert algo.get_rating(uuid) == 1500 + round(value / 2)
+
+
+def params(algo):
+    if isinstance(algo, SlidingWindowAlgo):
+        return (algo.days,)
+    if isinstance(algo, LastMatchesAlgo):
+        return (algo.n,)
+    return (algo.half_life,)
+
+
+def make_algos():
+    return [SlidingWindowAlgo(20), LastMatchesAlgo(5), DecayedEloAlgo(7)]
+
+
+def count_starts(algo):
+    starts = []
+    on_start = algo.on_start
+
+    def spy(tny):
+        starts.append(tny)
+        on_start(tny)
+
+    algo.on_start = spy
+    return starts
+
+
+@pytest.mark.parametrize("algo", make_algos())
+def test_appended_matches_are_read_incrementally(make_tournament, algo):
+    shn, tny = make_tournament(n_matches=60)
+    algo.start(tny)
+    starts = count_starts(algo)
+
+    late = shn.create_user("late")
+    tny.add_user(late)
+    users = [player.user for player in tny.players]
+    for i, (a, b) in enumerate(zip(users, users[3:] + [late])):
+        index = tny.insert_match([a, b], [b, b], time=(100 + i * 5) * DAY)
+        algo.update(tny, index)
+
+    match = tny.start_match([users[0], late])
+    match.record_win(late)
+    algo.add_match(match)
+
+    assert starts == []
+    assert algo.read == len(tny.matches)
+    expected = type(algo)(*params(algo))
+    assert ratings(algo.on_finish(tny)) == ratings(expected.start(tny))
+
+
+@pytest.mark.parametrize("algo", make_algos())
+def test_corrections_restart_the_window(make_tournament, algo):
+    shn, tny = make_tournament(n_matches=60)
+    algo.start(tny)
+
+    changed = algo.update(tny, tny.delete_match(tny.matches[50]))
+
+    assert changed
+    expected = type(algo)(*params(algo))
+    assert ratings(algo.on_finish(tny)) == ratings(expected.start(tny))
+
+
+def test_generated_leaderboards_are_updated_incrementally(make_tournament):
+    shn, tny = make_tournament(n_matches=60)
+    tny.generate_leaderboards(SlidingWindowAlgo, days=20)
+    (algo, _), = tny._rankers.values()
+    starts = count_starts(algo)
+
+    a, b = tny.players[0].user, tny.players[1].user
+    tny.insert_match([a, b], [a, a], time=70 * DAY)
+    lb = tny.generate_leaderboards(SlidingWindowAlgo, days=20)
+
+    assert starts == []
+    assert ratings(lb) == ratings(SlidingWindowAlgo(20).start(tny))
+